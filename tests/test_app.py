@@ -0,0 +1,40 @@
+import unittest
+from unittest import mock
+
+from varlens import app
+
+
+class EmptyListPopupTest(unittest.TestCase):
+    """The "nothing found" popups of the orphan and missing views return
+    without rebuilding the layout; the main view must still repaint."""
+
+    def make_app(self):
+        a = app.App.__new__(app.App)
+        a.stdscr = mock.Mock()
+        a.mgr = mock.Mock()
+        a.mgr.find_orphans.return_value = []
+        a.mgr.find_missing.return_value = []
+        a._orphans_cache = None
+        a._missing_cache = None
+        a._dirty_all = False
+        return a
+
+    def check(self, key, title):
+        a = self.make_app()
+        with mock.patch.object(app, "popup") as popup:
+            a._key(ord(key))
+        popup.assert_called_once()
+        self.assertEqual(popup.call_args[0][1], title)
+        self.assertTrue(a._dirty_all)
+
+    def test_no_orphans(self):
+        for key in "oO":
+            self.check(key, "Orphan Finder")
+
+    def test_no_missing(self):
+        for key in "mM":
+            self.check(key, "Missing Packages")
+
+
+if __name__ == "__main__":
+    unittest.main()
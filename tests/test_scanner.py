@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+
+from varlens import scanner
+
+
+class DetailSnapshotTest(unittest.TestCase):
+    """detail_snapshot() results are cached and shared between renders, so
+    their set fields must be immutable."""
+
+    def make_mgr(self):
+        mgr = scanner.VaMPackageManager.__new__(scanner.VaMPackageManager)
+        mgr.packages = {"A.Pkg.1": mock.sentinel.a, "B.Dep.2": mock.sentinel.b}
+        mgr._snapshot_cache = {}
+        mgr.package_info = mock.Mock(return_value={
+            "all_deps": ["B.Dep.2", "C.Gone.1"],
+        })
+        mgr.get_dep_tree = mock.Mock(return_value=[])
+        return mgr
+
+    def test_fields_are_frozensets(self):
+        snap = self.make_mgr().detail_snapshot("A.Pkg.1")
+        self.assertIsInstance(snap.owned, frozenset)
+        self.assertIsInstance(snap.missing, frozenset)
+        self.assertEqual(snap.owned, {"A.Pkg.1", "B.Dep.2", "C.Gone.1"})
+        self.assertEqual(snap.missing, {"C.Gone.1"})
+
+    def test_cached(self):
+        mgr = self.make_mgr()
+        self.assertIs(mgr.detail_snapshot("A.Pkg.1"), mgr.detail_snapshot("A.Pkg.1"))
+        mgr.package_info.assert_called_once()
+
+
+class DepTreeTest(unittest.TestCase):
+    def make_mgr(self, edges):
+        mgr = scanner.VaMPackageManager.__new__(scanner.VaMPackageManager)
+        mgr._deps_cache = {k: frozenset(v) for k, v in edges.items()}
+        mgr.packages = dict.fromkeys(mgr._deps_cache)
+        mgr._fwd_trans_cache = {}
+        return mgr
+
+    def test_shallow_path_expands_node_seen_deep_first(self):
+        # A.X.1 sits at depth 5 through the chain, but also at depth 1
+        chain = ["A.A.1", "A.B.1", "A.C.1", "A.D.1", "A.E.1",
+                 "A.X.1", "A.Y.1", "A.Z.1"]
+        edges = {a: {b} for a, b in zip(chain, chain[1:])}
+        edges["A.A.1"] = {"A.B.1", "A.X.1"}
+        edges["A.Z.1"] = set()
+        tree = self.make_mgr(edges).get_dep_tree("A.A.1")
+        self.assertIn(("A.Y.1", 2, "A.X.1"), tree)
+        self.assertIn(("A.Z.1", 3, "A.Y.1"), tree)
+        shown = {dep for dep, _, _ in tree}
+        self.assertEqual(shown, set(chain[1:]))
+
+    def test_subtree_shown_once(self):
+        edges = {
+            "A.Top.1": {"A.L.1", "A.R.1"},
+            "A.L.1": {"A.Shared.1"},
+            "A.R.1": {"A.Shared.1"},
+            "A.Shared.1": {"A.Leaf.1"},
+            "A.Leaf.1": set(),
+        }
+        tree = self.make_mgr(edges).get_dep_tree("A.Top.1")
+        self.assertEqual([t for t in tree if t[0] == "A.Leaf.1"],
+                         [("A.Leaf.1", 3, "A.Shared.1")])
+        self.assertEqual(len([t for t in tree if t[0] == "A.Shared.1"]), 2)
+
+
+class PackageRefPatternTest(unittest.TestCase):
+    def refs(self, text):
+        return [m.group("ref") for m in scanner.PACKAGE_REF_PATTERN.finditer(text)]
+
+    def test_plain_ref(self):
+        self.assertEqual(self.refs('"id": "Acid.Hair.9:/Custom/a.vam"'), ["Acid.Hair.9"])
+
+    def test_dotted_prefix_not_swallowed(self):
+        self.assertEqual(self.refs("foo.Acid.Hair.9:/"), ["Acid.Hair.9"])
+        self.assertEqual(self.refs("a.b.c.Acid.Hair.latest:/"), ["Acid.Hair.latest"])
+
+    def test_bytes_pattern_agrees(self):
+        m = scanner._PACKAGE_REF_BYTES.search(b"foo.Acid.Hair.9:/")
+        self.assertEqual(m.group("ref"), b"Acid.Hair.9")
+
+
+if __name__ == "__main__":
+    unittest.main()
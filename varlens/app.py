@@ -1,13 +1,21 @@
-import curses
+import curses, time
+from collections import OrderedDict
 from typing import Optional
 
+from . import ui
 from .scanner import VaMPackageManager
 from .ui import (
-    A, addstr, build_detail, clamp, confirm_popup, C_ACCENT, C_BORDER,
-    C_DANGER, C_DIM, C_OK, C_SEL, C_WARN, DetailPanel, draw_box, draw_footer,
-    draw_header, ListPanel, popup,
+    addstr, build_detail, clamp, confirm_popup, C_ACCENT, C_BORDER,
+    C_DANGER, C_DIM, C_OK, C_WARN, DetailPanel, draw_box, draw_footer,
+    draw_header, draw_list_row, ListPanel, popup,
 )
 
+# Filter edits are applied once typing has paused for this long (seconds)
+FILTER_DEBOUNCE = 0.04
+
+# Number of packages whose rendered detail lines are kept around
+DETAIL_CACHE_SIZE = 256
+
 
 class App:
     def __init__(self, stdscr, mgr: VaMPackageManager):
@@ -17,24 +25,86 @@ class App:
         self.status = ""
         self.filter_typing = False
         self.filter_buf = ""
+        # Single detail panel shared by the main view and the sub-views
+        self.dp: Optional[DetailPanel] = None
+        # Set by KEY_RESIZE; the layout is rebuilt once input goes idle so a
+        # burst of resize events costs a single _build().
+        self._need_rebuild = False
+        # monotonic() time of the last filter edit not yet applied
+        self._filter_dirty_since: Optional[float] = None
+        # (pid, mgr.version) -> build_detail() lines, least recently used
+        # first; entries from before a delete are never hit again.
+        self._detail_cache: OrderedDict = OrderedDict()
+        # find_orphans()/find_missing() results, valid until the next delete
+        self._orphans_cache: Optional[list] = None
+        self._missing_cache: Optional[list] = None
+        # Sorted package ids for the list panel and their lowercased forms,
+        # rebuilt after a delete
+        self._sorted_pids: Optional[list] = None
+        self._sorted_lower: Optional[list] = None
+
+        # Dirty flags: draw() only repaints the sections whose state changed.
+        self._dirty_all = True
+        self._dirty_header = True
+        self._dirty_list = True
+        self._dirty_detail = True
+        self._dirty_footer = True
+        self._dirty_filter = True
+        self._divider_drawn = False
 
         stdscr.timeout(100)
+        # The cursor is hidden; skip moving it back after every update
+        stdscr.leaveok(True)
         self._build()
 
     def _build(self):
+        self._need_rebuild = False
         h, w = self.stdscr.getmaxyx()
         lw = max(30, w // 3)
         dw = w - lw - 1
+        if self._sorted_pids is None:
+            self._sorted_pids = sorted(self.mgr.packages.keys())
+            self._sorted_lower = [p.lower() for p in self._sorted_pids]
         self.lp = ListPanel(
-            sorted(self.mgr.packages.keys()), y=1, x=0, h=h - 2, w=lw, title="Packages"
+            self._sorted_pids, y=1, x=0, h=h - 2, w=lw, title="Packages",
+            lower=self._sorted_lower,
         )
-        self.dp = DetailPanel(y=1, x=lw + 1, h=h - 2, w=dw)
+        if self.dp is None:
+            self.dp = DetailPanel(y=1, x=lw + 1, h=h - 2, w=dw)
+        else:
+            self.dp.resize(1, lw + 1, h - 2, dw)
+        self._refresh_detail()
+        self._dirty_all = True
+
+    def _apply_filter(self):
+        self.lp.apply_filter(self.filter_buf)
+
+    def _flush_filter(self):
+        """Apply pending filter edits once typing has paused."""
+        since = self._filter_dirty_since
+        if since is None or time.monotonic() - since < FILTER_DEBOUNCE:
+            return
+        self._filter_dirty_since = None
+        self._apply_filter()
         self._refresh_detail()
+        self._dirty_list = self._dirty_detail = True
+
+    def _detail(self, pid: str) -> list:
+        key = (pid, self.mgr.version)
+        content = self._detail_cache.get(key)
+        if content is None:
+            content = build_detail(self.mgr, pid)
+            self._detail_cache[key] = content
+            if len(self._detail_cache) > DETAIL_CACHE_SIZE:
+                self._detail_cache.popitem(last=False)
+        else:
+            self._detail_cache.move_to_end(key)
+        return content
 
     def _refresh_detail(self):
         pid = self.lp.selected()
         if pid:
-            self.dp.set_content(build_detail(self.mgr, pid))
+            self.dp.set_content(self._detail(pid))
         else:
             self.dp.set_content([("No packages found.", C_DIM, False)])
 
@@ -42,17 +112,43 @@ class App:
 
     def draw(self):
         h, w = self.stdscr.getmaxyx()
-        self.stdscr.erase()
+        full = self._dirty_all
+        if full:
+            self.stdscr.erase()
+            self._divider_drawn = False
+            self.lp.invalidate()
+            self.dp.invalidate()
+        # Whether anything below touched stdscr; if not, skip doupdate()
+        painted = full or self._dirty_header or self._dirty_footer
 
         lw = self.lp.w
-        draw_header(self.stdscr, str(self.mgr.vam_dir))
-
-        for r in range(1, h - 1):
-            addstr(self.stdscr, r, lw, "|", A(C_BORDER))
+        if full or self._dirty_header:
+            draw_header(self.stdscr, str(self.mgr.vam_dir))
 
-        self.lp.draw(self.stdscr, self.filter_typing, self.filter_buf)
-        self.dp.draw(self.stdscr)
+        if not self._divider_drawn:
+            for r in range(1, h - 1):
+                addstr(self.stdscr, r, lw, "|", ui.ATTR_BORDER)
+            self._divider_drawn = painted = True
+
+        if full or self._dirty_list or self._dirty_filter:
+            if self.lp.dirty(self.filter_typing, self.filter_buf):
+                self.lp.draw(self.stdscr, self.filter_typing, self.filter_buf)
+                painted = True
+        if (full or self._dirty_detail) and self.dp.dirty():
+            self.dp.draw(self.stdscr)
+            painted = True
+
+        if full or self._dirty_footer:
+            self._draw_footer()
+
+        self._dirty_all = self._dirty_header = self._dirty_list = False
+        self._dirty_detail = self._dirty_footer = self._dirty_filter = False
+        if painted:
+            self.stdscr.noutrefresh()
+            self.dp.noutrefresh()
+            curses.doupdate()
 
+    def _draw_footer(self):
         if self.filter_typing:
             fkeys = [
                 ("/", f"Filter: {self.filter_buf}"),
@@ -71,8 +167,6 @@ class App:
                 ("Q", "Quit"),
             ]
         draw_footer(self.stdscr, fkeys, status=self.status)
-        self.stdscr.noutrefresh()
-        curses.doupdate()
 
     # ── Event loop ────────────────────────────────────────────────────────────
 
@@ -81,6 +175,9 @@ class App:
             self.draw()
             key = self.stdscr.getch()
             if key == -1:
+                if self._need_rebuild:
+                    self._build()
+                self._flush_filter()
                 continue
             if self.filter_typing:
                 self._filter_key(key)
@@ -89,24 +186,31 @@ class App:
 
     def _filter_key(self, key):
         if key == curses.KEY_RESIZE:
-            self._build()
+            self._need_rebuild = True
+            return
         elif key in (curses.KEY_ENTER, 10, 13):
             self.filter_typing = False
-            self.lp.apply_filter(self.filter_buf)
+            self._filter_dirty_since = None
+            self._apply_filter()
             self._refresh_detail()
+            self._dirty_list = self._dirty_detail = True
         elif key == 27:
             self.filter_typing = False
             self.filter_buf = ""
+            self._filter_dirty_since = None
             self.lp.apply_filter("")
             self._refresh_detail()
+            self._dirty_list = self._dirty_detail = True
         elif key in (curses.KEY_BACKSPACE, 127, 8):
             self.filter_buf = self.filter_buf[:-1]
-            self.lp.apply_filter(self.filter_buf)
-            self._refresh_detail()
         elif 32 <= key < 127:
             self.filter_buf += chr(key)
-            self.lp.apply_filter(self.filter_buf)
-            self._refresh_detail()
+        else:
+            return
+        # Edits only echo the buffer; run() applies them via _flush_filter()
+        if self.filter_typing:
+            self._filter_dirty_since = time.monotonic()
+        self._dirty_footer = self._dirty_filter = True
 
     def _key(self, key):
         if key in (ord("q"), ord("Q")):
@@ -114,43 +218,56 @@ class App:
         elif key == curses.KEY_UP:
             self.lp.move(-1)
             self._refresh_detail()
+            self._dirty_list = self._dirty_detail = True
         elif key == curses.KEY_DOWN:
             self.lp.move(1)
             self._refresh_detail()
+            self._dirty_list = self._dirty_detail = True
         elif key == curses.KEY_PPAGE:
             self.lp.move(-10)
             self._refresh_detail()
+            self._dirty_list = self._dirty_detail = True
         elif key == curses.KEY_NPAGE:
             self.lp.move(10)
             self._refresh_detail()
+            self._dirty_list = self._dirty_detail = True
         elif key == curses.KEY_HOME:
             self.lp.cursor = 0
             self.lp.scroll = 0
             self._refresh_detail()
+            self._dirty_list = self._dirty_detail = True
         elif key == curses.KEY_END:
             self.lp.cursor = max(0, len(self.lp.items) - 1)
             self._refresh_detail()
+            self._dirty_list = self._dirty_detail = True
         elif key == ord("j"):
             self.dp.scroll_by(1)
+            self._dirty_detail = True
         elif key == ord("k"):
             self.dp.scroll_by(-1)
+            self._dirty_detail = True
         elif key == ord("/"):
             self.filter_typing = True
             self.filter_buf = ""
+            self._dirty_footer = self._dirty_filter = True
         elif key in (curses.KEY_ENTER, 10, 13, ord("i"), ord("I")):
             pid = self.lp.selected()
             if pid:
                 self._show_info(pid)
+                self._dirty_all = True
         elif key in (ord("d"), ord("D")):
             pid = self.lp.selected()
             if pid:
                 self._delete_flow(pid, with_deps=True)
+                self._dirty_all = True
         elif key in (ord("o"), ord("O")):
             self._show_orphans()
+            self._dirty_all = True
         elif key in (ord("m"), ord("M")):
             self._show_missing()
+            self._dirty_all = True
         elif key == curses.KEY_RESIZE:
-            self._build()
+            self._need_rebuild = True
 
     # ── Info popup ────────────────────────────────────────────────────────────
 
@@ -180,7 +297,9 @@ class App:
     # ── Orphan finder ─────────────────────────────────────────────────────────
 
     def _show_orphans(self):
-        orphans = self.mgr.find_orphans()
+        if self._orphans_cache is None:
+            self._orphans_cache = self.mgr.find_orphans()
+        orphans = self._orphans_cache
         if not orphans:
             popup(
                 self.stdscr,
@@ -191,6 +310,7 @@ class App:
             return
 
         total_mb = sum(mb for _, mb in orphans)
+        formatted = [f"{mb:6.1f} MB  {pid}" for pid, mb in orphans]
         scroll = 0
         cursor = 0
 
@@ -199,114 +319,149 @@ class App:
         dw = w - lw - 1
         panel_h = h - 2
 
-        dp = DetailPanel(y=1, x=lw + 1, h=panel_h, w=dw)
+        list_inner = panel_h - 4
+
+        dp = self.dp
+        dp.resize(1, lw + 1, panel_h, dw)
+        size = (h, w)
+        resized = False
 
         def refresh_detail():
             pid, mb = orphans[cursor]
-            dp.set_content(build_detail(self.mgr, pid))
-
-        refresh_detail()
+            dp.set_content(self._detail(pid))
 
-        while True:
-            h, w = self.stdscr.getmaxyx()
-            lw = max(30, w // 3)
-            dw = w - lw - 1
-            panel_h = h - 2
-            dp.y, dp.x, dp.h, dp.w = 1, lw + 1, panel_h, dw
-            dp._ih = panel_h - 2
-            list_inner = panel_h - 4
-
-            self.stdscr.erase()
-            draw_header(
-                self.stdscr,
-                f"Orphan Finder — {len(orphans)} unused  —  {total_mb:.1f} MB total",
-            )
-
-            for r in range(1, h - 1):
-                addstr(self.stdscr, r, lw, "|", A(C_BORDER))
+        def draw_row(idx):
+            text = formatted[idx] if idx < len(orphans) else None
+            draw_list_row(self.stdscr, 3 + idx - scroll, lw - 2, text,
+                          idx == cursor, ui.ATTR_DIM)
 
+        def draw_list():
             t = f"Orphans ({len(orphans)})"
             draw_box(self.stdscr, 1, 0, panel_h, lw, t, color=C_ACCENT)
 
             for i in range(list_inner):
-                idx = scroll + i
-                row = 3 + i
-                if idx >= len(orphans):
-                    addstr(self.stdscr, row, 1, " " * (lw - 2))
-                    continue
-                pid, mb = orphans[idx]
-                is_sel = idx == cursor
-                prefix = " > " if is_sel else "   "
-                line = f"{prefix}{mb:6.1f} MB  {pid}"
-                at = A(C_SEL, bold=True) if is_sel else A(C_DIM)
-                addstr(self.stdscr, row, 1, " " * (lw - 2))
-                addstr(self.stdscr, row, 1, line[: lw - 2], at)
+                draw_row(scroll + i)
 
             addstr(self.stdscr, 1 + panel_h - 2, 2,
-                   f" Total: {total_mb:.1f} MB "[: lw - 4], A(C_DIM))
+                   f" Total: {total_mb:.1f} MB "[: lw - 4], ui.ATTR_DIM)
 
             if len(orphans) > list_inner:
                 pct = int((scroll / max(1, len(orphans) - list_inner)) * (list_inner - 1))
-                addstr(self.stdscr, 3 + pct, lw - 1, "#", A(C_ACCENT))
+                addstr(self.stdscr, 3 + pct, lw - 1, "#", ui.ATTR_ACCENT)
 
-            dp.draw(self.stdscr)
+        refresh_detail()
 
-            draw_footer(
-                self.stdscr,
-                [
-                    ("^v", "Navigate"),
-                    ("jk", "Detail"),
-                    ("I", "Info"),
-                    ("D", "Del+Deps"),
-                    ("Q", "Close"),
-                ],
-                status=self.status,
-            )
-            self.stdscr.noutrefresh()
-            curses.doupdate()
+        # Full repaint on entry, paging, resize and after popups; plain
+        # cursor moves only repaint the rows and panels that changed.
+        full = True
+        painted = False
+        while True:
+            if full:
+                h, w = self.stdscr.getmaxyx()
+                if (h, w) != size:
+                    size = (h, w)
+                    lw = max(30, w // 3)
+                    dw = w - lw - 1
+                    panel_h = h - 2
+                    list_inner = panel_h - 4
+                    dp.resize(1, lw + 1, panel_h, dw)
+
+                self.stdscr.erase()
+                dp.invalidate()
+                draw_header(
+                    self.stdscr,
+                    f"Orphan Finder — {len(orphans)} unused  —  {total_mb:.1f} MB total",
+                )
+
+                for r in range(1, h - 1):
+                    addstr(self.stdscr, r, lw, "|", ui.ATTR_BORDER)
+
+                draw_list()
+                dp.draw(self.stdscr)
+
+                draw_footer(
+                    self.stdscr,
+                    [
+                        ("^v", "Navigate"),
+                        ("jk", "Detail"),
+                        ("I", "Info"),
+                        ("D", "Del+Deps"),
+                        ("Q", "Close"),
+                    ],
+                    status=self.status,
+                )
+                full = False
+                painted = True
+            # Idle ticks draw nothing, so only flush after a key or repaint
+            if painted:
+                self.stdscr.noutrefresh()
+                dp.noutrefresh()
+                curses.doupdate()
 
             key = self.stdscr.getch()
+            painted = key != -1
             if key == -1:
+                # Repaint once a burst of resize events has settled
+                if resized:
+                    resized = False
+                    full = True
                 continue
-            elif key == curses.KEY_UP:
-                cursor = max(0, cursor - 1)
-                if cursor < scroll:
-                    scroll = cursor
-                refresh_detail()
-            elif key == curses.KEY_DOWN:
-                cursor = min(len(orphans) - 1, cursor + 1)
-                if cursor >= scroll + list_inner:
-                    scroll = cursor - list_inner + 1
-                refresh_detail()
+            elif key in (curses.KEY_UP, curses.KEY_DOWN):
+                old_cursor, old_scroll = cursor, scroll
+                if key == curses.KEY_UP:
+                    cursor = max(0, cursor - 1)
+                    if cursor < scroll:
+                        scroll = cursor
+                else:
+                    cursor = min(len(orphans) - 1, cursor + 1)
+                    if cursor >= scroll + list_inner:
+                        scroll = cursor - list_inner + 1
+                if cursor != old_cursor:
+                    if scroll == old_scroll:
+                        draw_row(old_cursor)
+                        draw_row(cursor)
+                    else:
+                        draw_list()
+                    refresh_detail()
+                    dp.draw(self.stdscr)
             elif key == curses.KEY_PPAGE:
                 cursor = max(0, cursor - 10)
                 scroll = max(0, scroll - 10)
                 refresh_detail()
+                full = True
             elif key == curses.KEY_NPAGE:
                 cursor = min(len(orphans) - 1, cursor + 10)
                 scroll = min(max(0, len(orphans) - list_inner), scroll + 10)
                 refresh_detail()
+                full = True
             elif key == ord("j"):
                 dp.scroll_by(1)
+                dp.draw(self.stdscr)
             elif key == ord("k"):
                 dp.scroll_by(-1)
+                dp.draw(self.stdscr)
             elif key in (curses.KEY_ENTER, 10, 13, ord("i"), ord("I")):
                 pid, mb = orphans[cursor]
                 self._show_info(pid)
+                full = True
             elif key in (ord("d"), ord("D")):
                 pid, mb = orphans[cursor]
                 if pid:
                     self._delete_flow(pid, with_deps=True)
-                    orphans = self.mgr.find_orphans()
+                    if self._orphans_cache is None:
+                        self._orphans_cache = self.mgr.find_orphans()
+                    orphans = self._orphans_cache
                     total_mb = sum(mb for _, mb in orphans)
+                    formatted = [f"{mb:6.1f} MB  {pid}" for pid, mb in orphans]
                     cursor = min(cursor, max(0, len(orphans) - 1))
                     scroll = min(scroll, max(0, len(orphans) - list_inner))
                     if not orphans:
                         popup(self.stdscr, "Done", ["All orphans deleted!"], C_OK)
                         break
                     refresh_detail()
+                    full = True
             elif key == curses.KEY_RESIZE:
-                pass
+                resized = True
             elif key in (ord("q"), ord("Q")):
                 break
 
@@ -315,7 +470,9 @@ class App:
     # ── Missing packages ─────────────────────────────────────────────────────
 
     def _show_missing(self):
-        missing = self.mgr.find_missing()
+        if self._missing_cache is None:
+            self._missing_cache = self.mgr.find_missing()
+        missing = self._missing_cache
         if not missing:
             popup(
                 self.stdscr,
@@ -328,12 +485,21 @@ class App:
         cursor = 0
         scroll = 0
 
+        # Row text and detail lines never change while the view is open
+        formatted = [f"[{len(dependents):2d}] {mid}" for mid, dependents in missing]
+        detail_cache: dict = {}
+
         h, w = self.stdscr.getmaxyx()
         lw = max(30, w // 3)
         dw = w - lw - 1
         panel_h = h - 2
 
-        dp = DetailPanel(y=1, x=lw + 1, h=panel_h, w=dw)
+        list_inner = panel_h - 4
+
+        dp = self.dp
+        dp.resize(1, lw + 1, panel_h, dw)
+        size = (h, w)
+        resized = False
 
         def build_missing_detail(mid: str, dependents: list) -> list:
             lines = []
@@ -356,91 +522,116 @@ class App:
 
         def refresh_detail():
             mid, dependents = missing[cursor]
-            dp.set_content(build_missing_detail(mid, dependents))
+            lines = detail_cache.get(mid)
+            if lines is None:
+                lines = detail_cache[mid] = build_missing_detail(mid, dependents)
+            dp.set_content(lines)
 
-        refresh_detail()
-
-        while True:
-            h, w = self.stdscr.getmaxyx()
-            lw = max(30, w // 3)
-            dw = w - lw - 1
-            panel_h = h - 2
-            dp.y, dp.x, dp.h, dp.w = 1, lw + 1, panel_h, dw
-            dp._ih = panel_h - 2
-            list_inner = panel_h - 4
-
-            self.stdscr.erase()
-            draw_header(
-                self.stdscr,
-                f"Missing Packages — {len(missing)} absent",
-            )
-
-            for r in range(1, h - 1):
-                addstr(self.stdscr, r, lw, "|", A(C_BORDER))
+        def draw_row(idx):
+            text = formatted[idx] if idx < len(missing) else None
+            draw_list_row(self.stdscr, 3 + idx - scroll, lw - 2, text,
+                          idx == cursor, ui.ATTR_DANGER)
 
+        def draw_list():
             draw_box(self.stdscr, 1, 0, panel_h, lw,
                      f"Missing ({len(missing)})", color=C_DANGER)
 
             for i in range(list_inner):
-                idx = scroll + i
-                row = 3 + i
-                if idx >= len(missing):
-                    addstr(self.stdscr, row, 1, " " * (lw - 2))
-                    continue
-                mid, dependents = missing[idx]
-                is_sel = idx == cursor
-                prefix = " > " if is_sel else "   "
-                count_tag = f"[{len(dependents):2d}] "
-                line = prefix + count_tag + mid
-                at = A(C_SEL, bold=True) if is_sel else A(C_DANGER)
-                addstr(self.stdscr, row, 1, " " * (lw - 2))
-                addstr(self.stdscr, row, 1, line[: lw - 2], at)
+                draw_row(scroll + i)
 
             if len(missing) > list_inner:
                 pct = int((scroll / max(1, len(missing) - list_inner)) * (list_inner - 1))
-                addstr(self.stdscr, 3 + pct, lw - 1, "#", A(C_ACCENT))
+                addstr(self.stdscr, 3 + pct, lw - 1, "#", ui.ATTR_ACCENT)
 
-            dp.draw(self.stdscr)
+        refresh_detail()
 
-            draw_footer(
-                self.stdscr,
-                [
-                    ("^v", "Navigate"),
-                    ("jk", "Scroll detail"),
-                    ("Q", "Close"),
-                ],
-                status=self.status,
-            )
-            self.stdscr.noutrefresh()
-            curses.doupdate()
+        full = True
+        painted = False
+        while True:
+            if full:
+                h, w = self.stdscr.getmaxyx()
+                if (h, w) != size:
+                    size = (h, w)
+                    lw = max(30, w // 3)
+                    dw = w - lw - 1
+                    panel_h = h - 2
+                    list_inner = panel_h - 4
+                    dp.resize(1, lw + 1, panel_h, dw)
+
+                self.stdscr.erase()
+                dp.invalidate()
+                draw_header(
+                    self.stdscr,
+                    f"Missing Packages — {len(missing)} absent",
+                )
+
+                for r in range(1, h - 1):
+                    addstr(self.stdscr, r, lw, "|", ui.ATTR_BORDER)
+
+                draw_list()
+                dp.draw(self.stdscr)
+
+                draw_footer(
+                    self.stdscr,
+                    [
+                        ("^v", "Navigate"),
+                        ("jk", "Scroll detail"),
+                        ("Q", "Close"),
+                    ],
+                    status=self.status,
+                )
+                full = False
+                painted = True
+            # Idle ticks draw nothing, so only flush after a key or repaint
+            if painted:
+                self.stdscr.noutrefresh()
+                dp.noutrefresh()
+                curses.doupdate()
 
             key = self.stdscr.getch()
+            painted = key != -1
             if key == -1:
+                # Repaint once a burst of resize events has settled
+                if resized:
+                    resized = False
+                    full = True
                 continue
-            elif key == curses.KEY_UP:
-                cursor = max(0, cursor - 1)
-                if cursor < scroll:
-                    scroll = cursor
-                refresh_detail()
-            elif key == curses.KEY_DOWN:
-                cursor = min(len(missing) - 1, cursor + 1)
-                if cursor >= scroll + list_inner:
-                    scroll = cursor - list_inner + 1
-                refresh_detail()
+            elif key in (curses.KEY_UP, curses.KEY_DOWN):
+                old_cursor, old_scroll = cursor, scroll
+                if key == curses.KEY_UP:
+                    cursor = max(0, cursor - 1)
+                    if cursor < scroll:
+                        scroll = cursor
+                else:
+                    cursor = min(len(missing) - 1, cursor + 1)
+                    if cursor >= scroll + list_inner:
+                        scroll = cursor - list_inner + 1
+                if cursor != old_cursor:
+                    if scroll == old_scroll:
+                        draw_row(old_cursor)
+                        draw_row(cursor)
+                    else:
+                        draw_list()
+                    refresh_detail()
+                    dp.draw(self.stdscr)
             elif key == curses.KEY_PPAGE:
                 cursor = max(0, cursor - 10)
                 scroll = max(0, scroll - 10)
                 refresh_detail()
+                full = True
             elif key == curses.KEY_NPAGE:
                 cursor = min(len(missing) - 1, cursor + 10)
                 scroll = min(max(0, len(missing) - list_inner), scroll + 10)
                 refresh_detail()
+                full = True
             elif key == ord("j"):
                 dp.scroll_by(1)
+                dp.draw(self.stdscr)
             elif key == ord("k"):
                 dp.scroll_by(-1)
+                dp.draw(self.stdscr)
             elif key == curses.KEY_RESIZE:
-                pass
+                resized = True
             elif key in (ord("q"), ord("Q")):
                 break
 
@@ -464,12 +655,9 @@ class App:
             lines.append("")
 
         lines.append(f"Will delete {len(plan['to_delete'])} file(s):")
+        sizes = plan["to_delete_sizes"]
         for p in plan["to_delete"][:12]:
-            mb = (
-                self.mgr.packages[p].stat().st_size / (1024 * 1024)
-                if p in self.mgr.packages
-                else 0
-            )
+            mb = sizes.get(p, 0)
             lines.append(f"  {p}  ({mb:.1f} MB)")
         if len(plan["to_delete"]) > 12:
             lines.append(f"  ... and {len(plan['to_delete']) - 12} more")
@@ -489,6 +677,12 @@ class App:
             return
 
         results = self.mgr.execute_delete(plan)
+        # Detail entries are keyed on mgr.version, which the delete bumped;
+        # the view-level results below have no such key and are dropped.
+        self._orphans_cache = None
+        self._missing_cache = None
+        self._sorted_pids = None
+        self._sorted_lower = None
         ok = sum(1 for _, s, _ in results if s)
         fail = len(results) - ok
         self.status = f"Deleted {ok} package(s)." + (f" ({fail} errors)" if fail else "")
@@ -1,4 +1,4 @@
-import os, sys, curses
+import os, sys, curses, time
 from typing import Optional
 
 from .scanner import VaMPackageManager
@@ -65,9 +65,37 @@ def loading_screen(stdscr, path: str):
     stdscr.refresh()
 
 
+# Minimum time between two repaints of the scan progress screen (seconds)
+PROGRESS_INTERVAL = 0.033
+
+
 def make_progress_cb(stdscr, vam_dir: str):
+    path_msg = f"  {vam_dir}"
+    geom: dict = {}  # layout for the terminal size seen last
+    last = [0.0]  # monotonic() time of the last repaint
+    # Bar segments are sliced from these instead of rebuilt every repaint
+    full_bar = "█" * 60
+    empty_bar = "░" * 60
+
     def cb(scanned: int, cached: int, total: int, filename: str):
+        # Repaint at most ~30 times a second, but always show the final state
+        now = time.monotonic()
+        if now - last[0] < PROGRESS_INTERVAL and scanned + cached < total:
+            return
+        last[0] = now
+
         h, w = stdscr.getmaxyx()
+        if geom.get("size") != (h, w):
+            bar_w = max(0, min(60, w - 8))
+            geom.update(
+                size=(h, w),
+                cy=h // 2 - 3,
+                path_x=max(0, (w - len(path_msg)) // 2),
+                bar_w=bar_w,
+                bar_x=max(0, (w - bar_w - 2) // 2),
+            )
+        cy = geom["cy"]
+        bar_w = geom["bar_w"]
         stdscr.erase()
 
         stdscr.attron(A(C_HEADER, bold=True))
@@ -75,20 +103,15 @@ def make_progress_cb(stdscr, vam_dir: str):
         addstr(stdscr, 0, 2, "  VaM Package Manager  |  Loading...", A(C_HEADER, bold=True))
         stdscr.attroff(A(C_HEADER, bold=True))
 
-        cy = h // 2 - 3
-
-        path_msg = f"  {vam_dir}"
-        addstr(stdscr, cy, max(0, (w - len(path_msg)) // 2), path_msg, A(C_DIM))
+        addstr(stdscr, cy, geom["path_x"], path_msg, A(C_DIM))
 
-        fname = filename[:w - 6] if len(filename) > w - 6 else filename
+        fname = filename[:w - 6]
         addstr(stdscr, cy + 2, max(0, (w - len(fname)) // 2), fname, A(C_ACCENT, bold=True))
 
         done = scanned + cached
-        bar_w = min(60, w - 8)
         filled = int(bar_w * done / max(1, total))
-        bar = "█" * filled + "░" * (bar_w - filled)
-        bx = max(0, (w - bar_w - 2) // 2)
-        addstr(stdscr, cy + 4, bx, f"[{bar}]", A(C_BORDER, bold=True))
+        bar = full_bar[:filled] + empty_bar[:bar_w - filled]
+        addstr(stdscr, cy + 4, geom["bar_x"], f"[{bar}]", A(C_BORDER, bold=True))
 
         pct = int(100 * done / max(1, total))
         count_msg = f"{done} / {total}  ({cached} cached, {scanned} scanned)  {pct}%"
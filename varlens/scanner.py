@@ -1,50 +1,49 @@
-import os, json, zipfile, re, sqlite3, threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os, sys, json, zipfile, re, sqlite3
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from collections import defaultdict
-from typing import Optional
+from typing import NamedTuple, Optional
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  BACKEND
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Author.Package.Version:/ with every run length-bounded, so a scan stays
+# linear even on hostile content. Authors have no spaces, and neither part
+# has dots, so a dotted word in front of a ref is not pulled into it.
 PACKAGE_REF_PATTERN = re.compile(
-    r'([A-Za-z0-9][A-Za-z0-9_\- ]*\.[A-Za-z0-9_\-]+\.(?:\d+|latest)):/',
-    re.IGNORECASE,
+    r'(?P<ref>[A-Za-z0-9][A-Za-z0-9_\-]{1,63}'
+    r'\.[A-Za-z0-9_\-]{1,128}'
+    r'\.(?:\d{1,9}|latest)):/',
+    re.IGNORECASE | re.ASCII,
 )
+# Same pattern over raw archive bytes; it only matches ASCII, so entries are
+# scanned without decoding them first.
+_PACKAGE_REF_BYTES = re.compile(PACKAGE_REF_PATTERN.pattern.encode(), re.IGNORECASE)
 
 
-def is_valid_package_ref(ref: str) -> bool:
-    parts = ref.strip().split(".")
-    if len(parts) < 3:
-        return False
-    author = parts[0].strip()
-    pkg = ".".join(parts[1:-1])
-    version = parts[-1]
-
-    # Version must be digits or 'latest'
-    if not (version.isdigit() or version.lower() == "latest"):
-        return False
+# Author.Package.Version in one pass: the package part must start with a
+# letter and the version is digits or 'latest'. The author's own rules are
+# checked in is_valid_package_ref(), on the author with whitespace stripped.
+_VALID_REF = re.compile(r"([^.]*)\.([^\W\d_].*)\.(\d+|(?i:latest))", re.S)
+# Keywords that cannot be used as an author
+_RESERVED_AUTHORS = frozenset({"entries"})
 
-    # Author: reject single-char names
-    if len(author) < 2:
-        return False
-    # Author: reject all-digit (e.g. "1", "19")
-    if author.isdigit():
-        return False
-    # Author: reject version-like prefixes — 'v' or '-' followed by only digits/dots
-    if author[0] in ("v", "-") and all(c.isdigit() or c == "." for c in author[1:]):
-        return False
-    # Author: reserved keywords that cannot be used as author
-    if author in ("entries"):
-        return False
 
-    # Package: must be non-empty and start with a letter
-    if not pkg or not pkg[0].isalpha():
+def is_valid_package_ref(ref: str) -> bool:
+    m = _VALID_REF.fullmatch(ref.strip())
+    if not m:
         return False
-
-    return True
+    author = m.group(1).strip()
+    # Reject single-char, all-digit ("19") and version-like ("v2", "-19")
+    # authors, and reserved keywords
+    return not (
+        len(author) < 2
+        or author.isdigit()
+        or (author[0] in "v-" and author[1:].isdigit())
+        or author in _RESERVED_AUTHORS
+    )
 
 
 def parse_package_name(filename: str) -> Optional[str]:
@@ -63,24 +62,53 @@ def parse_package_name(filename: str) -> Optional[str]:
 
 def find_all_vars(vam_dir: str) -> dict:
     packages = {}
+    entries = {}  # pid -> DirEntry of the kept file, for its cached stat()
     duplicates = {}  # pid -> [Path, ...] of all paths seen
-    for root, _, files in os.walk(vam_dir):
-        for f in files:
-            if f.lower().endswith(".var"):
-                pid = parse_package_name(f)
-                if not pid:
-                    continue
-                path = Path(root) / f
-                if pid not in packages:
-                    packages[pid] = path
-                else:
-                    # Track every collision
-                    if pid not in duplicates:
-                        duplicates[pid] = [packages[pid]]
-                    duplicates[pid].append(path)
-                    # Keep the largest file
-                    if path.stat().st_size > packages[pid].stat().st_size:
+    # Iterative scandir walk in the same top-down order as os.walk, without
+    # its per-directory lists and extra stat calls.
+    stack = [vam_dir]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    # Errors are handled per entry so one bad entry (dangling
+                    # link, no permission) costs only itself, as with os.walk
+                    try:
+                        is_dir = e.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not e.is_symlink():
+                            subdirs.append(e.path)
+                        continue
+                    if not e.name.lower().endswith(".var"):
+                        continue
+                    pid = parse_package_name(e.name)
+                    if not pid:
+                        continue
+                    # Interned so every dep set shares one copy of each id
+                    pid = sys.intern(pid)
+                    path = Path(e.path)
+                    if pid not in packages:
                         packages[pid] = path
+                        entries[pid] = e
+                    else:
+                        # Track every collision
+                        if pid not in duplicates:
+                            duplicates[pid] = [packages[pid]]
+                        duplicates[pid].append(path)
+                        # Keep the largest file
+                        try:
+                            larger = e.stat().st_size > entries[pid].stat().st_size
+                        except OSError:
+                            larger = False
+                        if larger:
+                            packages[pid] = path
+                            entries[pid] = e
+        except OSError:
+            pass  # unreadable directory; keep whatever was listed
+        stack.extend(reversed(subdirs))
 
     if duplicates:
         import logging
@@ -95,7 +123,22 @@ def find_all_vars(vam_dir: str) -> dict:
     return packages
 
 
-def resolve_ref(ref: str, packages: dict) -> str:
+def build_latest_index(packages: dict) -> dict:
+    """Map each Author.PackName base to its highest numbered installed pid."""
+    best: dict = {}  # base -> (version int, pid)
+    for pid in packages:
+        base, _, ver = pid.rpartition(".")
+        if not base or "." not in base or not ver.isdigit():
+            continue
+        v = int(ver)
+        cur = best.get(base)
+        # Strictly greater, so the first of equal versions wins as before
+        if cur is None or v > cur[0]:
+            best[base] = (v, pid)
+    return {base: pid for base, (_, pid) in best.items()}
+
+
+def resolve_ref(ref: str, packages: dict, latest: Optional[dict] = None) -> str:
     parts = ref.split(".")
     if len(parts) < 3:
         return ref
@@ -107,6 +150,10 @@ def resolve_ref(ref: str, packages: dict) -> str:
     if ref in packages:
         return ref
 
+    # --- index from build_latest_index(): one dict hit instead of a scan ---
+    if latest is not None:
+        return latest.get(base, ref)
+
     # --- collect all installed versions for this Author.PackName base ---
     candidates = []
     for pid in packages:
@@ -147,13 +194,8 @@ def read_meta_json(var_path: Path) -> Optional[dict]:
     return None
 
 
-def extract_refs_from_meta(var_path: Path) -> set:
+def _refs_from_meta(meta: dict, self_id: Optional[str]) -> set:
     refs = set()
-    self_id = parse_package_name(var_path.name)
-    meta = read_meta_json(var_path)
-    if not meta:
-        return refs
-
     raw_deps = meta.get("dependencies", {})
 
     # Support both { "Pkg": "URL" } AND [ "Pkg1", "Pkg2" ]
@@ -177,40 +219,142 @@ def extract_refs_from_meta(var_path: Path) -> set:
     return refs
 
 
-def extract_refs_from_var(var_path: Path) -> set:
-    TEXT_EXTS = {
-        ".scene", ".person", ".json",
-        ".vap", ".vab", ".vac", ".vps", ".vmp", ".vms",
-        ".skin", ".uip",
-        ".cslist", ".cs",
-    }
+def extract_refs_from_meta(var_path: Path) -> set:
+    meta = read_meta_json(var_path)
+    if not meta:
+        return set()
+    return _refs_from_meta(meta, parse_package_name(var_path.name))
+
+
+# Entry suffixes worth scanning for refs; a tuple so str.endswith takes it
+TEXT_EXTS = (
+    ".scene", ".person", ".json",
+    ".vap", ".vab", ".vac", ".vps", ".vmp", ".vms",
+    ".skin", ".uip",
+    ".cslist", ".cs",
+)
+
 
+def _refs_from_entries(z: zipfile.ZipFile, self_id: Optional[str]) -> set:
     refs = set()
+    seen = set()  # (CRC, size) of entries already scanned
+    # Walk the ZipInfo records directly: read() then needs no name lookup,
+    # and empty entries are skipped before anything is opened.
+    for info in z.infolist():
+        if not info.file_size or not info.filename.lower().endswith(TEXT_EXTS):
+            continue
+        # Packages often ship the same file under several names; identical
+        # content cannot add refs, so only the first copy is inflated.
+        key = (info.CRC, info.file_size)
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            content = z.read(info)
+            for m in _PACKAGE_REF_BYTES.finditer(content):
+                r = m.group("ref").decode("ascii")
+                # Normalise .Latest / .LATEST -> .latest
+                rparts = r.split(".")
+                if rparts[-1].lower() == "latest":
+                    rparts[-1] = "latest"
+                    r = ".".join(rparts)
+                if not is_valid_package_ref(r):
+                    continue
+                if r != self_id:
+                    refs.add(r)
+        except Exception:
+            pass
+    return refs
+
+
+def extract_refs_from_var(var_path: Path) -> set:
+    try:
+        with zipfile.ZipFile(var_path, "r") as z:
+            return _refs_from_entries(z, parse_package_name(var_path.name))
+    except Exception:
+        return set()
+
+
+# meta.json fields package_info shows, kept from the scan so it need not
+# reopen the archive
+META_FIELDS = ("creatorName", "licenseType", "description")
+
+
+def _scan_archive(var_path: Path) -> tuple:
+    """(refs, meta fields) for one archive, opening the zip only once."""
     self_id = parse_package_name(var_path.name)
     try:
         with zipfile.ZipFile(var_path, "r") as z:
-            for entry in z.namelist():
-                ext = Path(entry).suffix.lower()
-                if ext not in TEXT_EXTS:
-                    continue
-                try:
-                    content = z.open(entry).read().decode("utf-8", errors="ignore")
-                    for m in PACKAGE_REF_PATTERN.finditer(content):
-                        r = m.group(1).strip()
-                        # Normalise .Latest / .LATEST -> .latest
-                        rparts = r.split(".")
-                        if rparts[-1].lower() == "latest":
-                            rparts[-1] = "latest"
-                            r = ".".join(rparts)
-                        if not is_valid_package_ref(r):
-                            continue
-                        if r != self_id:
-                            refs.add(r)
-                except Exception:
-                    pass
+            try:
+                meta = json.loads(z.read("meta.json"))
+            except Exception:
+                meta = None
+            if not isinstance(meta, dict):
+                meta = {}
+            fields = {k: meta[k] for k in META_FIELDS if k in meta}
+            refs = _refs_from_meta(meta, self_id) if meta else set()
+            if not refs:
+                refs = _refs_from_entries(z, self_id)
+            return refs, fields
     except Exception:
-        pass
-    return refs
+        return set(), {}
+
+
+def _scan_one(item: tuple) -> tuple:
+    """Refs and meta for one (pid, path) item; module-level so worker processes can run it."""
+    pid, path = item
+    refs, meta = _scan_archive(path)
+    return pid, refs - {pid}, meta
+
+
+# Below this many archives to scan, starting worker processes costs more
+# than it saves, so they are scanned in this process
+PROCESS_SCAN_MIN = 32
+
+
+def _scan_all(items: list):
+    """Yield _scan_one() for every item, in order.
+
+    Uses a process pool when there is enough work. If the pool cannot start
+    or breaks (no fork/spawn support, frozen entry points, a killed worker),
+    the items it did not deliver are scanned in a thread pool instead.
+    """
+    if len(items) < PROCESS_SCAN_MIN:
+        yield from map(_scan_one, items)
+        return
+    done = 0
+    try:
+        with ProcessPoolExecutor() as executor:
+            for result in executor.map(_scan_one, items, chunksize=16):
+                yield result
+                done += 1
+        return
+    except (OSError, RuntimeError, NotImplementedError, ImportError):
+        pass  # BrokenProcessPool is a RuntimeError
+    with ThreadPoolExecutor() as executor:
+        yield from executor.map(_scan_one, items[done:])
+
+
+def _try_stat(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+def _reachable(graph: dict, seed) -> set:
+    """Every node reachable from seed (seed included) in graph: node -> set."""
+    # Expand a whole BFS level per step so the work happens inside C-level
+    # set operations rather than a Python loop per edge.
+    visited: set = set()
+    frontier = set(seed)
+    while frontier:
+        visited |= frontier
+        nxt: set = set()
+        for node in frontier:
+            nxt.update(graph.get(node, ()))
+        frontier = nxt - visited
+    return visited
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -219,79 +363,163 @@ def extract_refs_from_var(var_path: Path) -> set:
 
 
 class PackageCache:
+    # Bumped whenever the package_refs layout changes; older tables are
+    # dropped and rebuilt by the next scan.
+    SCHEMA_VERSION = 3
 
     def __init__(self, vam_dir: Path):
         cache_dir = vam_dir / "Cache"
         cache_dir.mkdir(exist_ok=True)
         db_path = cache_dir / "vam_pkg_cache.db"
         try:
-            self._con = sqlite3.connect(str(db_path))
+            # Autocommit mode: batched writes open their own explicit
+            # transaction in _executemany. The connection may be handed to
+            # another thread, but only one writes at a time.
+            self._con = sqlite3.connect(
+                str(db_path), isolation_level=None, check_same_thread=False
+            )
             self._con.execute("PRAGMA journal_mode=WAL")
+            # WAL stays consistent without an fsync on every commit
+            self._con.execute("PRAGMA synchronous=NORMAL")
+            self._con.execute("PRAGMA temp_store=MEMORY")
+            self._con.execute("PRAGMA cache_size=-65536")  # 64 MiB
+            self._con.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+            version = self._con.execute("PRAGMA user_version").fetchone()[0]
+            if version < self.SCHEMA_VERSION:
+                self._con.execute("DROP TABLE IF EXISTS package_refs")
+                self._con.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+            # mtime is integer nanoseconds so it compares exactly; refs are
+            # newline-separated, which splits back faster than JSON parses.
+            # meta holds the META_FIELDS of meta.json as JSON, NULL if unknown.
             self._con.execute(
                 """
                 CREATE TABLE IF NOT EXISTS package_refs (
                     filename  TEXT PRIMARY KEY,
-                    mtime     REAL NOT NULL,
+                    mtime_ns  INTEGER NOT NULL,
                     size      INTEGER NOT NULL,
-                    refs      TEXT NOT NULL
+                    refs      TEXT NOT NULL,
+                    meta      TEXT
                 )
                 """
             )
-            self._con.commit()
+            # Read the whole index in one query; lookups are then dict hits
+            # instead of one SELECT per package.
+            self._rows = {
+                row[0]: row[1:]
+                for row in self._con.execute(
+                    "SELECT filename, mtime_ns, size, refs, meta FROM package_refs"
+                )
+            }
             self._ok = True
         except Exception:
             self._con = None
+            self._rows = {}
             self._ok = False
 
-    def lookup(self, path: Path) -> Optional[set]:
+    def _row(self, path: Path, st: Optional[os.stat_result]) -> Optional[tuple]:
+        """The cached (mtime_ns, size, refs, meta) row for path if still current."""
+        if st is None:
+            st = path.stat()
+        row = self._rows.get(path.name)
+        if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            return row
+        return None
+
+    def lookup(self, path: Path, st: Optional[os.stat_result] = None) -> Optional[set]:
         """Return cached refs for path if mtime+size match, else None."""
         if not self._ok:
             return None
         try:
-            st = path.stat()
-            row = self._con.execute(
-                "SELECT mtime, size, refs FROM package_refs WHERE filename = ?",
-                (path.name,),
-            ).fetchone()
-            if row and abs(row[0] - st.st_mtime) < 0.001 and row[1] == st.st_size:
-                return set(json.loads(row[2]))
+            row = self._row(path, st)
+            if row:
+                return set(row[2].split("\n")) if row[2] else set()
+        except Exception:
+            pass
+        return None
+
+    def lookup_meta(self, path: Path, st: Optional[os.stat_result] = None) -> Optional[dict]:
+        """Return cached meta fields for path if mtime+size match, else None."""
+        if not self._ok:
+            return None
+        try:
+            row = self._row(path, st)
+            if row and row[3] is not None:
+                return json.loads(row[3])
         except Exception:
             pass
         return None
 
-    def store(self, path: Path, refs: set):
-        """Persist refs for path."""
+    def store(self, path: Path, refs: set, st: Optional[os.stat_result] = None,
+              meta: Optional[dict] = None):
+        """Persist refs (and meta fields, if known) for path."""
         if not self._ok:
             return
         try:
-            st = path.stat()
+            if st is None:
+                st = path.stat()
             self._con.execute(
                 """
-                INSERT OR REPLACE INTO package_refs (filename, mtime, size, refs)
-                VALUES (?, ?, ?, ?)
+                INSERT OR REPLACE INTO package_refs (filename, mtime_ns, size, refs, meta)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                self._encode(path, refs, st, meta),
+            )
+        except Exception:
+            pass
+
+    def store_many(self, items: list):
+        """Persist (path, refs, stat_result, meta) items in a single transaction."""
+        if not self._ok or not items:
+            return
+        try:
+            self._executemany(
+                """
+                INSERT OR REPLACE INTO package_refs (filename, mtime_ns, size, refs, meta)
+                VALUES (?, ?, ?, ?, ?)
                 """,
-                (path.name, st.st_mtime, st.st_size, json.dumps(sorted(refs))),
+                [self._encode(*item) for item in items],
             )
-            self._con.commit()
         except Exception:
             pass
 
+    @staticmethod
+    def _encode(path: Path, refs: set, st: os.stat_result, meta: Optional[dict]) -> tuple:
+        return (
+            path.name,
+            st.st_mtime_ns,
+            st.st_size,
+            "\n".join(sorted(refs)),
+            json.dumps(meta) if meta is not None else None,
+        )
+
     def prune(self, known_filenames: set):
         """Remove rows for packages that no longer exist on disk."""
         if not self._ok:
             return
         try:
-            rows = self._con.execute("SELECT filename FROM package_refs").fetchall()
-            stale = [r[0] for r in rows if r[0] not in known_filenames]
+            # The index is already in memory, so the anti-join against the
+            # files on disk is a set difference; only stale names go to SQL.
+            stale = self._rows.keys() - known_filenames
+            for f in stale:
+                del self._rows[f]
             if stale:
-                self._con.executemany(
+                self._executemany(
                     "DELETE FROM package_refs WHERE filename = ?",
                     [(f,) for f in stale],
                 )
-                self._con.commit()
         except Exception:
             pass
 
+    def _executemany(self, sql: str, rows: list):
+        """Run sql for every row inside one write transaction."""
+        self._con.execute("BEGIN IMMEDIATE")
+        try:
+            self._con.executemany(sql, rows)
+        except Exception:
+            self._con.execute("ROLLBACK")
+            raise
+        self._con.execute("COMMIT")
+
     def close(self):
         if self._con:
             try:
@@ -305,12 +533,33 @@ class PackageCache:
 # ─────────────────────────────────────────────────────────────────────────────
 
 
+class DetailSnapshot(NamedTuple):
+    """Everything the detail panel shows for one package."""
+    info: dict  # package_info()
+    tree: list  # get_dep_tree()
+    owned: frozenset  # the package and its transitive dependencies
+    missing: frozenset  # members of owned that are not installed
+
+
+# Number of DetailSnapshots kept by VaMPackageManager.detail_snapshot
+SNAPSHOT_CACHE_SIZE = 4096
+
+
 class VaMPackageManager:
     def __init__(self, vam_dir: str, progress_cb=None):
         self.vam_dir = Path(vam_dir)
         self.packages: dict = find_all_vars(str(self.vam_dir))
-        self._rdeps_cache: Optional[dict] = None
-        self._lock = threading.Lock()
+        # Reverse graph as (id_of, pid_by_id, indptr, indices), see _build_reverse_deps
+        self._rdeps_cache: Optional[tuple] = None
+        self._stat_cache: dict = {}  # Path -> os.stat_result
+        # Bumped whenever packages or the dependency graph change, so
+        # callers can key their own caches on it.
+        self.version = 0
+        self._meta_cache: dict = {}  # pid -> META_FIELDS subset of meta.json
+        # Transitive closures per pid; both are reset whenever the graph changes
+        self._fwd_trans_cache: dict = {}
+        self._rev_trans_cache: dict = {}
+        self._snapshot_cache: dict = {}  # pid -> DetailSnapshot
 
         cache = PackageCache(self.vam_dir)
         known_filenames = {p.name for p in self.packages.values()}
@@ -320,12 +569,25 @@ class VaMPackageManager:
         self._scanned = 0
         self._cached = 0
         self._deps_cache: dict = {}
+        self._latest: dict = build_latest_index(self.packages)
+
+        # Stat every package up front; the pool keeps many stat() calls in
+        # flight at once instead of paying each one's latency in turn.
+        with ThreadPoolExecutor() as executor:
+            stats = dict(zip(self.packages, executor.map(_try_stat, self.packages.values())))
+        for pid, st in stats.items():
+            if st is not None:
+                self._stat_cache[self.packages[pid]] = st
 
         # First, separate cached from needs-scanning
         to_scan = []
         for pid, path in self.packages.items():
-            refs = cache.lookup(path)
+            st = stats[pid]
+            refs = cache.lookup(path, st) if st is not None else None
             if refs is not None:
+                meta = cache.lookup_meta(path, st)
+                if meta is not None:
+                    self._meta_cache[pid] = meta
                 self._cached += 1
                 self._process_refs(pid, refs)
                 if progress_cb and self._cached % 10 == 0:
@@ -333,38 +595,42 @@ class VaMPackageManager:
             else:
                 to_scan.append((pid, path))
 
-        # Parallel scan for the rest
+        # Parallel scan for the rest. Inflating and regex-scanning archives is
+        # CPU-bound, so it runs in worker processes where possible (see
+        # _scan_all); results come back to this process, which alone writes
+        # the cache.
         if to_scan:
-            with ThreadPoolExecutor() as executor:
-                futures = {executor.submit(self._scan_package, pid, path): (pid, path) for pid, path in to_scan}
-                for future in as_completed(futures):
-                    pid, path, refs = future.result()
-                    with self._lock:
-                        cache.store(path, refs)
-                        self._scanned += 1
-                        self._process_refs(pid, refs)
-                        if progress_cb:
-                            progress_cb(self._scanned, self._cached, total, path.name)
+            to_store = []
+            for pid, refs, meta in _scan_all(to_scan):
+                path = self.packages[pid]
+                self._meta_cache[pid] = meta
+                if stats[pid] is not None:
+                    to_store.append((path, refs, stats[pid], meta))
+                self._scanned += 1
+                self._process_refs(pid, refs)
+                if progress_cb:
+                    progress_cb(self._scanned, self._cached, total, path.name)
+            # One transaction for the whole scan instead of a commit per package
+            cache.store_many(to_store)
         elif progress_cb:
              # If everything was cached, still trigger a final progress update
              progress_cb(0, self._cached, total, "Done")
 
         cache.close()
 
-    def _scan_package(self, pid: str, path: Path):
-        meta_refs = extract_refs_from_meta(path)
-        if meta_refs:
-            refs = meta_refs - {pid}
-        else:
-            refs = extract_refs_from_var(path) - {pid}
-        return pid, path, refs
+    def _stat(self, path: Path) -> os.stat_result:
+        st = self._stat_cache.get(path)
+        if st is None:
+            st = self._stat_cache[path] = path.stat()
+        return st
 
     def _process_refs(self, pid: str, refs: set):
         direct: set = set()
         for ref in refs:
             if ref != pid:
-                direct.add(resolve_ref(ref, self.packages))
-        self._deps_cache[pid] = direct
+                direct.add(resolve_ref(ref, self.packages, self._latest))
+        # Frozen: the sets are shared read-only with callers
+        self._deps_cache[pid] = frozenset(map(sys.intern, direct))
 
     # ── forward deps ──────────────────────────────────────────────────────────
 
@@ -373,47 +639,89 @@ class VaMPackageManager:
             return set()
 
         if not recursive:
-            return set(self._deps_cache.get(pid, set()))
+            return self._deps_cache.get(pid, frozenset())
 
-        visited: set = set()
-        queue = list(self._deps_cache.get(pid, set()))
-        while queue:
-            dep = queue.pop()
-            if dep in visited:
-                continue
-            visited.add(dep)
-            for s in self._deps_cache.get(dep, set()):
-                if s not in visited:
-                    queue.append(s)
-        return visited
+        deps = self._fwd_trans_cache.get(pid)
+        if deps is None:
+            deps = self._fwd_trans_cache[pid] = _reachable(
+                self._deps_cache, self._deps_cache.get(pid, ())
+            )
+        return set(deps)
 
     # ── reverse deps ──────────────────────────────────────────────────────────
 
-    def _build_reverse_deps(self) -> dict:
+    def _build_reverse_deps(self) -> tuple:
+        """Reverse edges in CSR form: the dependents of node i are
+        pid_by_id[j] for j in indices[indptr[i]:indptr[i + 1]]."""
         if self._rdeps_cache is not None:
             return self._rdeps_cache
-        rdeps: dict = defaultdict(set)
+        id_of: dict = {}
+        pid_by_id: list = []
+        edges = []  # (dep id, dependent id)
         for pid in self.packages:
+            if pid not in id_of:
+                id_of[pid] = len(pid_by_id)
+                pid_by_id.append(pid)
+            src = id_of[pid]
             for dep in self.get_dependencies(pid, recursive=False):
-                rdeps[dep].add(pid)
-        self._rdeps_cache = dict(rdeps)
+                if dep not in id_of:
+                    id_of[dep] = len(pid_by_id)
+                    pid_by_id.append(dep)
+                edges.append((id_of[dep], src))
+
+        n = len(pid_by_id)
+        indptr = array("i", bytes(4 * (n + 1)))
+        for dst, _ in edges:
+            indptr[dst + 1] += 1
+        for i in range(n):
+            indptr[i + 1] += indptr[i]
+        indices = array("i", bytes(4 * len(edges)))
+        fill = indptr[:-1]  # next free slot per node
+        for dst, src in edges:
+            indices[fill[dst]] = src
+            fill[dst] += 1
+
+        self._rdeps_cache = (id_of, pid_by_id, indptr, indices)
         return self._rdeps_cache
 
     def get_dependents(self, pid: str) -> set:
-        rdeps = self._build_reverse_deps()
-        alias = latest_alias(pid)
-        seed = set(rdeps.get(pid, [])) | set(rdeps.get(alias, []) if alias else [])
-        visited: set = set()
-        queue = list(seed)
-        while queue:
-            p = queue.pop()
-            if p in visited:
-                continue
-            visited.add(p)
-            for x in rdeps.get(p, []):
-                if x not in visited:
-                    queue.append(x)
-        return visited
+        return set(self._dependents(pid))
+
+    def count_dependents_outside(self, pid: str, owned) -> int:
+        """Number of packages using pid that are not in owned."""
+        dependents = self._dependents(pid)
+        if not dependents:
+            return 0
+        if owned.isdisjoint(dependents):
+            return len(dependents)
+        return len(dependents) - len(dependents & owned)
+
+    def _dependents(self, pid: str) -> frozenset:
+        dependents = self._rev_trans_cache.get(pid)
+        if dependents is None:
+            id_of, pid_by_id, indptr, indices = self._build_reverse_deps()
+            visited = bytearray(len(pid_by_id))
+            stack = array("i")
+            found = []
+            # Seed with the direct dependents of pid and of its .latest alias
+            alias = latest_alias(pid)
+            for start in (id_of.get(pid), id_of.get(alias) if alias else None):
+                if start is None:
+                    continue
+                for j in indices[indptr[start]:indptr[start + 1]]:
+                    if not visited[j]:
+                        visited[j] = 1
+                        stack.append(j)
+                        found.append(j)
+            while stack:
+                i = stack.pop()
+                for j in indices[indptr[i]:indptr[i + 1]]:
+                    if not visited[j]:
+                        visited[j] = 1
+                        stack.append(j)
+                        found.append(j)
+            dependents = self._rev_trans_cache[pid] = frozenset(pid_by_id[j] for j in found)
+        return dependents
 
     # ── queries ───────────────────────────────────────────────────────────────
 
@@ -451,25 +759,53 @@ class VaMPackageManager:
                 return False
             return int(ver) < best
 
+        # Every node the walk can reach is in all_deps, so decide once per dep
+        # rather than once per edge.
+        superseded = {dep for dep in all_deps if is_superseded(dep)}
+
+        # Shallowest depth of every node within max_depth, found breadth-first
+        deps_cache = self._deps_cache
+        min_depth = {pid: 0}
+        level = [pid]
+        for depth in range(1, max_depth + 1):
+            nxt = []
+            for node in level:
+                for dep in deps_cache.get(node, ()):
+                    if dep not in min_depth and dep not in superseded:
+                        min_depth[dep] = depth
+                        nxt.append(dep)
+            level = nxt
+
+        # Iterative pre-order walk: each stack frame is the remaining children
+        # of one node. A package's subtree is shown once, under its first
+        # appearance at its shallowest depth; every other appearance is
+        # listed without it. Expanding the first appearance instead would
+        # cut off children of a node first met deep in another branch.
         result = []
-        def walk(node, depth, visited):
-            if depth > max_depth:
-                return
-            for dep in sorted(self._deps_cache.get(node, set())):
-                if is_superseded(dep):
-                    continue
-                result.append((dep, depth, node))
-                if dep not in visited:
-                    walk(dep, depth + 1, visited | {dep})
-        walk(pid, 1, {pid})
+        expanded = {pid}
+        stack = [(iter(sorted(deps_cache.get(pid, ()))), 1, pid)] if max_depth >= 1 else []
+        while stack:
+            children, depth, node = stack[-1]
+            dep = next(children, None)
+            if dep is None:
+                stack.pop()
+                continue
+            if dep in superseded:
+                continue
+            result.append((dep, depth, node))
+            if depth < max_depth and dep not in expanded and min_depth[dep] == depth:
+                expanded.add(dep)
+                stack.append((iter(sorted(deps_cache.get(dep, ()))), depth + 1, dep))
         return result
 
     def package_info(self, pid: str) -> dict:
         if pid not in self.packages:
             return {}
         path = self.packages[pid]
-        size_mb = path.stat().st_size / (1024 * 1024)
-        meta = read_meta_json(path)
+        size_mb = self._stat(path).st_size / (1024 * 1024)
+        meta = self._meta_cache.get(pid)
+        if meta is None:
+            meta = read_meta_json(path)
         direct = self.get_dependencies(pid, recursive=False)
         all_deps = self.get_dependencies(pid, recursive=True)
         dependents = self.get_dependents(pid)
@@ -486,6 +822,27 @@ class VaMPackageManager:
             "missing_deps": sorted(d for d in all_deps if d not in self.packages),
         }
 
+    def detail_snapshot(self, pid: str) -> Optional[DetailSnapshot]:
+        """package_info() and get_dep_tree() for pid in one cached bundle,
+        or None if pid is not installed."""
+        snap = self._snapshot_cache.get(pid)
+        if snap is None:
+            info = self.package_info(pid)
+            if not info:
+                return None
+            owned = frozenset(info["all_deps"]).union((pid,))
+            snap = DetailSnapshot(
+                info=info,
+                tree=self.get_dep_tree(pid),
+                owned=owned,
+                missing=owned.difference(self.packages),
+            )
+            if len(self._snapshot_cache) >= SNAPSHOT_CACHE_SIZE:
+                # Dicts keep insertion order: drop the oldest entry
+                del self._snapshot_cache[next(iter(self._snapshot_cache))]
+            self._snapshot_cache[pid] = snap
+        return snap
+
     def find_missing(self) -> list:
         missing: dict = {}  # missing_pid -> set of installed packages that need it
         for pid, deps in self._deps_cache.items():
@@ -500,40 +857,24 @@ class VaMPackageManager:
         return result
 
     def find_orphans(self) -> list:
-        orphans = []
-        for pid in self.packages:
-            parts = pid.split(".")
-            base = ".".join(parts[:-1])       # e.g. "AshAuryn.Sexpressions"
-            version = parts[-1]               # e.g. "6"
-
-            used = False
-            for other_pid, deps in self._deps_cache.items():
-                if other_pid == pid:
-                    continue
-                for dep in deps:
-                    dep_parts = dep.split(".")
-                    dep_base = ".".join(dep_parts[:-1])
-                    dep_ver = dep_parts[-1]
-                    if dep_base != base:
-                        continue
-                    # exact match
-                    if dep_ver == version:
-                        used = True
-                        break
-                    # .latest match — this dep could resolve to our pid
-                    if dep_ver == "latest" and version.isdigit():
-                        # only counts if our version is the highest installed
-                        highest = resolve_ref(dep, self.packages)
-                        if highest == pid:
-                            used = True
-                            break
-                if used:
-                    break
-
-            if not used:
-                size_mb = self.packages[pid].stat().st_size / (1024 * 1024)
-                orphans.append((pid, size_mb))
-
+        # One pass over every edge collects the packages something else uses
+        # (a package depending on itself does not count). A .latest dep uses
+        # whatever version it resolves to.
+        used: set = set()
+        for other_pid, deps in self._deps_cache.items():
+            for dep in deps:
+                if dep != other_pid:
+                    used.add(dep)
+                if dep.endswith(".latest"):
+                    highest = resolve_ref(dep, self.packages, self._latest)
+                    if highest != other_pid:
+                        used.add(highest)
+
+        orphans = [
+            (pid, self._stat(path).st_size / (1024 * 1024))
+            for pid, path in self.packages.items()
+            if pid not in used
+        ]
         orphans.sort(key=lambda x: x[1], reverse=True)
         return orphans
 
@@ -545,14 +886,15 @@ class VaMPackageManager:
         dependents = self.get_dependents(pid)
 
         if not with_deps:
-            total_mb = self.packages[pid].stat().st_size / (1024 * 1024)
+            size_mb = self._stat(self.packages[pid]).st_size / (1024 * 1024)
             return {
                 "target": pid,
                 "dependents": sorted(dependents),
                 "to_delete": [pid],
+                "to_delete_sizes": {pid: size_mb},
                 "keep_deps": [],
                 "delete_deps": [],
-                "total_mb": total_mb,
+                "total_mb": size_mb,
             }
 
         # Collect all transitive deps that are actually installed
@@ -581,18 +923,19 @@ class VaMPackageManager:
 
         delete_deps = sorted(all_deps & to_delete - {pid})
 
-        total_mb = sum(
-            self.packages[p].stat().st_size / (1024 * 1024)
+        sizes = {
+            p: self._stat(self.packages[p]).st_size / (1024 * 1024)
             for p in to_delete
             if p in self.packages
-        )
+        }
         return {
             "target": pid,
             "dependents": sorted(dependents),
             "to_delete": sorted(to_delete),
+            "to_delete_sizes": sizes,
             "keep_deps": keep_deps,
             "delete_deps": delete_deps,
-            "total_mb": total_mb,
+            "total_mb": sum(sizes.values()),
         }
 
     def execute_delete(self, plan: dict) -> list:
@@ -602,12 +945,21 @@ class VaMPackageManager:
             if path and path.exists():
                 try:
                     path.unlink()
+                    self._stat_cache.pop(path, None)
                     del self.packages[pid]
+                    self._meta_cache.pop(pid, None)
                     self._deps_cache.pop(pid, None)
                     self._rdeps_cache = None
+                    self._fwd_trans_cache.clear()
+                    self._rev_trans_cache.clear()
+                    self._snapshot_cache.clear()
                     results.append((pid, True, "Deleted"))
                 except Exception as e:
                     results.append((pid, False, str(e)))
             else:
                 results.append((pid, False, "File not found"))
+        # Removing a version can change which one a base resolves to
+        self._latest = build_latest_index(self.packages)
+        if any(ok for _, ok, _ in results):
+            self.version += 1
         return results
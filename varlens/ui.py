@@ -1,4 +1,6 @@
 import curses, textwrap
+from functools import lru_cache, partial
+from itertools import compress
 from typing import Optional
 
 from .scanner import VaMPackageManager
@@ -19,6 +21,21 @@ C_TITLE  = 7
 C_BORDER = 8
 C_WARN   = 9
 
+# Attributes used on every frame, filled in by init_colors() once the color
+# pairs exist. A() stays available for anything picked at runtime.
+ATTR_BORDER   = 0
+ATTR_ACCENT   = 0
+ATTR_DANGER   = 0
+ATTR_DIM      = 0
+ATTR_DIM_B    = 0
+ATTR_HEADER   = 0
+ATTR_HEADER_B = 0
+ATTR_SEL_B    = 0
+ATTR_TITLE_B  = 0
+
+# (pair, bold) -> attribute for every pair above, filled in by init_colors()
+ATTRS: dict = {}
+
 
 def init_colors():
     curses.start_color()
@@ -34,89 +51,120 @@ def init_colors():
     curses.init_pair(C_BORDER, curses.COLOR_CYAN,   bg)
     curses.init_pair(C_WARN,   curses.COLOR_YELLOW, bg)
 
+    ATTRS.update({
+        (pair, bold): curses.color_pair(pair) | (curses.A_BOLD if bold else 0)
+        for pair in range(C_WARN + 1)
+        for bold in (False, True)
+    })
+
+    global ATTR_BORDER, ATTR_ACCENT, ATTR_DANGER, ATTR_DIM, ATTR_DIM_B
+    global ATTR_HEADER, ATTR_HEADER_B, ATTR_SEL_B, ATTR_TITLE_B
+    ATTR_BORDER   = A(C_BORDER)
+    ATTR_ACCENT   = A(C_ACCENT)
+    ATTR_DANGER   = A(C_DANGER)
+    ATTR_DIM      = A(C_DIM)
+    ATTR_DIM_B    = A(C_DIM, bold=True)
+    ATTR_HEADER   = A(C_HEADER)
+    ATTR_HEADER_B = A(C_HEADER, bold=True)
+    ATTR_SEL_B    = A(C_SEL, bold=True)
+    ATTR_TITLE_B  = A(C_TITLE, bold=True)
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  DRAWING HELPERS
 # ─────────────────────────────────────────────────────────────────────────────
 
 def A(pair, bold=False):
-    a = curses.color_pair(pair)
-    if bold:
-        a |= curses.A_BOLD
+    a = ATTRS.get((pair, bold))
+    if a is None:
+        a = curses.color_pair(pair)
+        if bold:
+            a |= curses.A_BOLD
     return a
 
 
-def addstr(win, y, x, text, attr=0):
-    h, w = win.getmaxyx()
+def addstr(win, y, x, text, attr=0, maxyx=None):
+    # Callers drawing many strings pass win.getmaxyx() in once as maxyx
+    h, w = maxyx or win.getmaxyx()
     if y < 0 or y >= h or x < 0 or x >= w:
         return
-    avail = w - x
-    if avail <= 0:
-        return
     try:
-        win.addstr(y, x, text[:avail], attr)
+        # addnstr clips at the right edge without building a sliced copy
+        win.addnstr(y, x, text, w - x, attr)
     except curses.error:
         pass
 
 
-def draw_box(win, y, x, h, w, title="", color=C_BORDER):
+def _as_bytes(text: str):
+    """text as ASCII bytes where possible, which curses writes without
+    converting them to a wide-character string first; str otherwise."""
+    return text.encode("ascii") if text.isascii() else text
+
+
+def draw_box(win, y, x, h, w, title="", color=C_BORDER, maxyx=None):
     a = A(color, bold=True)
+    win.attron(a)
     try:
-        win.attron(a)
+        win.hline(y, x + 1, curses.ACS_HLINE, w - 2)
+        win.hline(y + h - 1, x + 1, curses.ACS_HLINE, w - 2)
+        win.vline(y + 1, x, curses.ACS_VLINE, h - 2)
+        win.vline(y + 1, x + w - 1, curses.ACS_VLINE, h - 2)
         win.addch(y, x, curses.ACS_ULCORNER)
         win.addch(y, x + w - 1, curses.ACS_URCORNER)
         win.addch(y + h - 1, x, curses.ACS_LLCORNER)
+        # Last, as it fails (after drawing) in a window's bottom-right cell
         win.addch(y + h - 1, x + w - 1, curses.ACS_LRCORNER)
-        for i in range(1, w - 1):
-            win.addch(y, x + i, curses.ACS_HLINE)
-            win.addch(y + h - 1, x + i, curses.ACS_HLINE)
-        for i in range(1, h - 1):
-            win.addch(y + i, x, curses.ACS_VLINE)
-            win.addch(y + i, x + w - 1, curses.ACS_VLINE)
-        win.attroff(a)
     except curses.error:
         pass
+    win.attroff(a)
     if title:
         label = f" {title} "
         tx = x + max(1, (w - len(label)) // 2)
-        addstr(win, y, tx, label, A(C_TITLE, bold=True))
+        addstr(win, y, tx, label, ATTR_TITLE_B, maxyx)
 
 
 def draw_header(win, subtitle=""):
     h, w = win.getmaxyx()
-    win.attron(A(C_HEADER, bold=True))
+    win.attron(ATTR_HEADER_B)
     win.hline(0, 0, " ", w)
     text = "  VarLens"
     if subtitle:
         text += f"  |  {subtitle}"
-    addstr(win, 0, 1, text[: w - 2], A(C_HEADER, bold=True))
-    win.attroff(A(C_HEADER, bold=True))
+    addstr(win, 0, 1, text[: w - 2], ATTR_HEADER_B, (h, w))
+    win.attroff(ATTR_HEADER_B)
 
 
-def draw_footer(win, keys: list, status=""):
-    h, w = win.getmaxyx()
-    win.attron(A(C_HEADER))
-    win.hline(h - 1, 0, " ", w)
+@lru_cache(maxsize=32)
+def _compose_footer(keys: tuple, w: int):
+    """Lay out footer key hints for width w: ([(x, text, is_key)], end x)."""
+    spans = []
     x = 1
     for k, desc in keys:
         label = f" {k} "
         if x + len(label) + len(desc) + 3 >= w:
             break
-        try:
-            win.addstr(h - 1, x, label, A(C_SEL, bold=True))
-        except curses.error:
-            pass
+        spans.append((x, label, True))
         x += len(label)
+        spans.append((x, f" {desc}  ", False))
+        x += len(desc) + 3
+    return tuple(spans), x
+
+
+def draw_footer(win, keys: list, status=""):
+    h, w = win.getmaxyx()
+    spans, x = _compose_footer(tuple(keys), w)
+    win.attron(ATTR_HEADER)
+    win.hline(h - 1, 0, " ", w)
+    for sx, text, is_key in spans:
         try:
-            win.addstr(h - 1, x, f" {desc}  ", A(C_HEADER))
+            win.addnstr(h - 1, sx, text, w - sx, ATTR_SEL_B if is_key else ATTR_HEADER)
         except curses.error:
             pass
-        x += len(desc) + 3
     if status:
         msg = f" {status} "
         sx = max(x, w - len(msg) - 1)
-        addstr(win, h - 1, sx, msg[: w - sx], A(C_SEL, bold=True))
-    win.attroff(A(C_HEADER))
+        addstr(win, h - 1, sx, msg[: w - sx], ATTR_SEL_B, (h, w))
+    win.attroff(ATTR_HEADER)
 
 
 def clamp(v, lo, hi):
@@ -127,8 +175,11 @@ def fuzzy_match(pattern: str, text: str) -> bool:
     """True if all characters in 'pattern' appear in 'text' in order."""
     if not pattern:
         return True
-    pattern = pattern.lower()
-    text = text.lower()
+    return _subsequence(pattern.lower(), text.lower())
+
+
+def _subsequence(pattern: str, text: str) -> bool:
+    """fuzzy_match for already-lowercased, non-empty inputs."""
     it = iter(text)
     return all(c in it for c in pattern)
 
@@ -137,6 +188,19 @@ def fuzzy_match(pattern: str, text: str) -> bool:
 #  POPUPS
 # ─────────────────────────────────────────────────────────────────────────────
 
+_PRESS_ANY_KEY = "[ Press any key ]"
+_CONFIRM_KEYS = "[ Y ] Confirm    [ N ] Cancel"
+
+
+def _popup_body(win, lines, width, first_attr, attr):
+    """Write lines from row 2, column 3, each clipped to width."""
+    try:
+        for i, line in enumerate(lines):
+            win.addnstr(i + 2, 3, line, width, first_attr if i == 0 else attr)
+    except curses.error:
+        pass
+
+
 def popup(stdscr, title: str, lines: list, color=C_ACCENT):
     h, w = stdscr.getmaxyx()
     dw = min(max((len(l) for l in lines), default=20) + 8, w - 4)
@@ -145,12 +209,14 @@ def popup(stdscr, title: str, lines: list, color=C_ACCENT):
     dy = (h - dh) // 2
     dx = (w - dw) // 2
     win = curses.newwin(dh, dw, dy, dx)
+    win.leaveok(True)
     win.bkgd(" ")
-    draw_box(win, 0, 0, dh, dw, title, color=color)
-    for i, line in enumerate(lines[: dh - 4]):
-        addstr(win, i + 2, 3, line[: dw - 6], A(C_DIM))
-    addstr(win, dh - 2, 3, "[ Press any key ]", A(color, bold=True))
-    win.refresh()
+    maxyx = (dh, dw)
+    draw_box(win, 0, 0, dh, dw, title, color=color, maxyx=maxyx)
+    _popup_body(win, lines[: dh - 4], dw - 6, ATTR_DIM, ATTR_DIM)
+    addstr(win, dh - 2, 3, _PRESS_ANY_KEY, A(color, bold=True), maxyx)
+    win.noutrefresh()
+    curses.doupdate()
     win.getch()
 
 
@@ -162,15 +228,16 @@ def confirm_popup(stdscr, title: str, lines: list, danger=False) -> bool:
     dy = (h - dh) // 2
     dx = (w - dw) // 2
     win = curses.newwin(dh, dw, dy, dx)
+    win.leaveok(True)
     win.bkgd(" ")
     col = C_DANGER if danger else C_ACCENT
-    draw_box(win, 0, 0, dh, dw, title, color=col)
-    for i, line in enumerate(lines[: dh - 5]):
-        c = C_DANGER if (i == 0 and danger) else C_DIM
-        b = i == 0
-        addstr(win, i + 2, 3, line[: dw - 6], A(c, bold=b))
-    addstr(win, dh - 2, 3, "[ Y ] Confirm    [ N ] Cancel", A(C_WARN, bold=True))
-    win.refresh()
+    maxyx = (dh, dw)
+    draw_box(win, 0, 0, dh, dw, title, color=col, maxyx=maxyx)
+    first = A(C_DANGER if danger else C_DIM, bold=True)
+    _popup_body(win, lines[: dh - 5], dw - 6, first, ATTR_DIM)
+    addstr(win, dh - 2, 3, _CONFIRM_KEYS, A(C_WARN, bold=True), maxyx)
+    win.noutrefresh()
+    curses.doupdate()
     while True:
         k = win.getch()
         if k in (ord("y"), ord("Y")):
@@ -183,10 +250,27 @@ def confirm_popup(stdscr, title: str, lines: list, danger=False) -> bool:
 #  LIST PANEL
 # ─────────────────────────────────────────────────────────────────────────────
 
+def draw_list_row(win, row, width, text, is_sel, attr, x=1):
+    """Paint one list row: the cursor marker and text, padded to width so
+    the single write also clears whatever the row showed before. A text of
+    None blanks the row."""
+    if text is None:
+        line = " " * width
+    else:
+        line = ((" > " if is_sel else "   ") + text).ljust(width)[:width]
+    addstr(win, row, x, line, ATTR_SEL_B if is_sel else attr)
+
+
 class ListPanel:
-    def __init__(self, items, y, x, h, w, title=""):
+    def __init__(self, items, y, x, h, w, title="", lower=None):
         self.all_items = list(items)
-        self.items = list(items)
+        self.items = self.all_items  # rebound, never mutated, so may share
+        # Lowercased names, index-aligned with all_items and items; callers
+        # that rebuild the panel often pass in a list they keep themselves.
+        if lower is None:
+            lower = [i.lower() for i in self.all_items]
+        self._all_lower = lower
+        self._items_lower = self._all_lower
         self.cursor = 0
         self.scroll = 0
         self.y, self.x, self.h, self.w = y, x, h, w
@@ -194,19 +278,51 @@ class ListPanel:
         self.filter_str = ""
         self.focused = True
         self._ih = h - 4  # inner rows (box top + bottom + filter bar)
+        self._blank = " " * (w - 2)  # one row's width of padding
+        self._blank_b = _as_bytes(self._blank)
+        # (item, selected) -> padded row text, ready for addnstr
+        self._rows: dict = {}
+        # What the screen currently shows, so draw() repaints only what
+        # changed; invalidate() forces a full repaint (e.g. after erase()).
+        self._drawn: Optional[tuple] = None  # (cursor, scroll, focused)
+        self._drawn_filter: Optional[tuple] = None  # (typing, buffer, filter)
+        self._dirty_box = True
 
     def apply_filter(self, s: str):
-        self.filter_str = s.lower()
-        if not self.filter_str:
-            self.items = list(self.all_items)
+        """Filter all_items by s.
+
+        When the current filter is a prefix of s, every match of s is among
+        the current items, so only those are tested.
+        """
+        f = s.lower()
+        if not f:
+            self.items = self.all_items
+            self._items_lower = self._all_lower
         else:
-            self.items = [i for i in self.all_items if fuzzy_match(self.filter_str, i)]
+            if self.filter_str and f.startswith(self.filter_str):
+                pool, lower = self.items, self._items_lower
+            else:
+                pool, lower = self.all_items, self._all_lower
+            mask = list(map(partial(_subsequence, f), lower))
+            self.items = list(compress(pool, mask))
+            self._items_lower = list(compress(lower, mask))
+        self.filter_str = f
         self.cursor = 0
         self.scroll = 0
+        self._dirty_box = True  # title count and every row change
 
     def reload(self, items):
         self.all_items = list(items)
-        self.apply_filter(self.filter_str)
+        self._all_lower = [i.lower() for i in self.all_items]
+        self._rows.clear()
+        # Refilter from scratch; the current items belong to the old list
+        f, self.filter_str = self.filter_str, ""
+        self.apply_filter(f)
+
+    def invalidate(self):
+        self._drawn = None
+        self._drawn_filter = None
+        self._dirty_box = True
 
     def move(self, delta: int):
         n = len(self.items)
@@ -221,42 +337,74 @@ class ListPanel:
     def selected(self) -> Optional[str]:
         return self.items[self.cursor] if self.items else None
 
+    def dirty(self, filter_typing=False, filter_buf="") -> bool:
+        """True if draw() with these arguments would change the screen."""
+        return (
+            self._dirty_box
+            or self._drawn != (self.cursor, self.scroll, self.focused)
+            or self._drawn_filter != (filter_typing, filter_buf, self.filter_str)
+        )
+
     def draw(self, win, filter_typing=False, filter_buf=""):
-        bc = C_ACCENT if self.focused else C_BORDER
-        t = f"{self.title} ({len(self.items)}/{len(self.all_items)})"
-        draw_box(win, self.y, self.x, self.h, self.w, t, color=bc)
-
-        fy = self.y + self.h - 2
-        if filter_typing:
-            fb = f" /{filter_buf}_"
-        elif self.filter_str:
-            fb = f" /{self.filter_str}"
+        if not self.dirty(filter_typing, filter_buf):
+            return
+        maxyx = win.getmaxyx()
+        state = (self.cursor, self.scroll, self.focused)
+        prev = self._drawn
+        full = self._dirty_box or prev is None or prev[1:] != state[1:]
+
+        if full:
+            bc = C_ACCENT if self.focused else C_BORDER
+            t = f"{self.title} ({len(self.items)}/{len(self.all_items)})"
+            draw_box(win, self.y, self.x, self.h, self.w, t, color=bc, maxyx=maxyx)
+
+        fstate = (filter_typing, filter_buf, self.filter_str)
+        if full or fstate != self._drawn_filter:
+            fy = self.y + self.h - 2
+            if filter_typing:
+                fb = f" /{filter_buf}_"
+            elif self.filter_str:
+                fb = f" /{self.filter_str}"
+            else:
+                fb = " (/ to filter)"
+            # Padded so a shorter query clears the previous one
+            addstr(win, fy, self.x + 2, fb[: self.w - 4].ljust(self.w - 4),
+                   A(C_WARN if filter_typing else C_DIM), maxyx)
+
+        if full:
+            rows = range(self._ih)
+        elif prev[0] != self.cursor:
+            # Same scroll offset: only the old and new cursor rows change
+            rows = [r for r in (prev[0] - self.scroll, self.cursor - self.scroll)
+                    if 0 <= r < self._ih]
         else:
-            fb = " (/ to filter)"
-        addstr(win, fy, self.x + 2, fb[: self.w - 4], A(C_WARN if filter_typing else C_DIM))
+            rows = ()
 
-        for i in range(self._ih):
+        a_sel = ATTR_SEL_B if self.focused else ATTR_DIM_B
+        a_norm = ATTR_DIM
+        cache = self._rows
+        for i in rows:
             idx = self.scroll + i
             row = self.y + 2 + i
             if idx >= len(self.items):
-                addstr(win, row, self.x + 1, " " * (self.w - 2))
+                addstr(win, row, self.x + 1, self._blank_b, 0, maxyx)
                 continue
             item = self.items[idx]
             is_sel = idx == self.cursor
-            prefix = " > " if is_sel else "   "
-            text = prefix + item
-            at = (
-                A(C_SEL, bold=True) if (is_sel and self.focused)
-                else A(C_DIM, bold=True) if is_sel
-                else A(C_DIM)
-            )
-            addstr(win, row, self.x + 1, " " * (self.w - 2))
-            addstr(win, row, self.x + 1, text[: self.w - 2], at)
+            text = cache.get((item, is_sel))
+            if text is None:
+                prefix = " > " if is_sel else "   "
+                text = cache[item, is_sel] = _as_bytes((prefix + item + self._blank)[: self.w - 2])
+            addstr(win, row, self.x + 1, text, a_sel if is_sel else a_norm, maxyx)
 
         n = len(self.items)
-        if n > self._ih:
+        if full and n > self._ih:
             pct = int((self.scroll / max(1, n - self._ih)) * (self._ih - 1))
-            addstr(win, self.y + 2 + pct, self.x + self.w - 1, "#", A(C_ACCENT))
+            addstr(win, self.y + 2 + pct, self.x + self.w - 1, "#", ATTR_ACCENT, maxyx)
+
+        self._drawn = state
+        self._drawn_filter = fstate
+        self._dirty_box = False
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -269,8 +417,29 @@ class DetailPanel:
         self.lines: list = []  # list of (text, color_id, bold)
         self.scroll = 0
         self._ih = h - 2
+        # (lines, scroll) last painted; draw() is a no-op while they match
+        self._drawn: Optional[tuple] = None
+        # All of lines rendered once; scrolling only moves the visible window
+        # over it. Rebuilt lazily by draw() after set_content() or resize().
+        self._pad = None
+
+    def resize(self, y, x, h, w):
+        self.y, self.x, self.h, self.w = y, x, h, w
+        self._ih = h - 2
+        self.scroll = clamp(self.scroll, 0, max(0, len(self.lines) - self._ih))
+        self._drawn = None
+        self._pad = None
+
+    def invalidate(self):
+        self._drawn = None
+
+    def dirty(self) -> bool:
+        prev = self._drawn
+        return prev is None or prev[0] is not self.lines or prev[1] != self.scroll
 
     def set_content(self, lines):
+        if lines is not self.lines:
+            self._pad = None
         self.lines = lines
         self.scroll = 0
 
@@ -278,25 +447,71 @@ class DetailPanel:
         self.scroll = clamp(self.scroll + d, 0, max(0, len(self.lines) - self._ih))
 
     def draw(self, win):
-        draw_box(win, self.y, self.x, self.h, self.w, "Details")
-        for i, (text, col, bold) in enumerate(
-            self.lines[self.scroll : self.scroll + self._ih]
-        ):
-            addstr(win, self.y + 1 + i, self.x + 2, text[: self.w - 4], A(col, bold=bold))
+        if not self.dirty():
+            return
+        maxyx = win.getmaxyx()
+        draw_box(win, self.y, self.x, self.h, self.w, "Details", maxyx=maxyx)
+        if self._pad is None:
+            self._render()
         n = len(self.lines)
         if n > self._ih:
             pct = int((self.scroll / max(1, n - self._ih)) * (self._ih - 1))
-            addstr(win, self.y + 1 + pct, self.x + self.w - 1, "#", A(C_ACCENT))
+            addstr(win, self.y + 1 + pct, self.x + self.w - 1, "#", ATTR_ACCENT, maxyx)
+        self._drawn = (self.lines, self.scroll)
+
+    def _render(self):
+        tw = max(1, self.w - 4)
+        pad = curses.newpad(max(1, self._ih, len(self.lines)), tw)
+        pad.leaveok(True)
+        attrs = {}  # (col, bold) -> attribute, for the few pairs used
+        for i, (text, col, bold) in enumerate(self.lines):
+            at = attrs.get((col, bold))
+            if at is None:
+                at = attrs[col, bold] = A(col, bold=bold)
+            try:
+                pad.addnstr(i, 0, _as_bytes(text.ljust(tw)), tw, at)
+            except curses.error:
+                pass  # the pad's bottom-right cell
+        self._pad = pad
+
+    def noutrefresh(self):
+        """Copy the visible part of the pad to the virtual screen.
+
+        Call after noutrefresh() of the window the panel is drawn on, which
+        would otherwise cover the pad area with its own (blank) cells.
+        """
+        if self._pad is None or self._ih <= 0:
+            return
+        self._pad.touchwin()
+        try:
+            self._pad.noutrefresh(
+                self.scroll, 0,
+                self.y + 1, self.x + 2,
+                self.y + self._ih, self.x + self.w - 3,
+            )
+        except curses.error:
+            pass
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  DETAIL CONTENT BUILDER
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Tree branch prefixes, indexed by indent level
+_TREE_PREFIX = tuple("  " * d + "└─ " for d in range(32))
+
+
+@lru_cache(maxsize=1024)
+def _wrap(text: str, width: int) -> tuple:
+    """textwrap.wrap, memoized: descriptions are rewrapped on every rebuild."""
+    return tuple(textwrap.wrap(text, width))
+
+
 def build_detail(mgr: VaMPackageManager, pid: str) -> list:
-    info = mgr.package_info(pid)
-    if not info:
+    snap = mgr.detail_snapshot(pid)
+    if snap is None:
         return [("Package not found.", C_DANGER, True)]
+    info = snap.info
 
     lines = []
 
@@ -317,25 +532,33 @@ def build_detail(mgr: VaMPackageManager, pid: str) -> list:
     row(f"  Path     : {info['path']}")
     if info["description"]:
         blank()
-        for chunk in textwrap.wrap(info["description"], 44):
+        for chunk in _wrap(info["description"], 44):
             row(f"  {chunk}")
     blank()
     sep()
 
-    owned: set = set(info["all_deps"]) | {pid}
+    owned = snap.owned
+    missing = snap.missing
+
+    # Count of packages outside this one's closure that use dep; most deps
+    # show up in both lists below, so each is computed once.
+    others_of: dict = {}
+
+    def others(dep: str) -> int:
+        n = others_of.get(dep)
+        if n is None:
+            n = others_of[dep] = mgr.count_dependents_outside(dep, owned)
+        return n
 
     # ── Direct dependencies ───────────────────────────────────────────────
     row(f"  Direct dependencies ({len(info['direct_deps'])}):", C_ACCENT, True)
     if info["direct_deps"]:
         for d in info["direct_deps"]:
-            present = d in mgr.packages
-            if not present:
+            if d in missing:
                 status = "[MISSING]"
                 col = C_DANGER
             else:
-                users = mgr.get_dependents(d)
-                others = users - owned
-                n = len(others)
+                n = others(d)
                 if n == 0:
                     status = "[ok | only you]"
                     col = C_OK
@@ -350,27 +573,23 @@ def build_detail(mgr: VaMPackageManager, pid: str) -> list:
 
     # ── All transitive dependencies (tree view) ──────────────────────────
     row(f"  All transitive dependencies ({len(info['all_deps'])}):", C_ACCENT, True)
-    tree = mgr.get_dep_tree(pid)
+    tree = snap.tree
     if tree:
-        prev_via = {}  # dep -> via, to detect repeated via lines
-        last_depth = 0
         for dep, depth, via in tree:
-            present = dep in mgr.packages
-            if not present:
+            if dep in missing:
                 tag = "[MISSING]"
                 col = C_DANGER
             else:
-                others = mgr.get_dependents(dep) - owned
-                n = len(others)
+                n = others(dep)
                 tag = "[ok | only you]" if n == 0 else f"[ok | +{n} others]"
                 col = C_OK if n == 0 else C_WARN
             if depth == 1:
                 row(f"    {tag} {dep}", col)
             else:
-                indent = "  " * depth
-                # tree branch characters
-                prefix = indent + "└─ "
-                row(f"  {prefix}{tag} {dep}", col)
+                # Rows are indented one level past their depth
+                d = depth + 1
+                prefix = _TREE_PREFIX[d] if d < len(_TREE_PREFIX) else "  " * d + "└─ "
+                row(f"{prefix}{tag} {dep}", col)
     else:
         row("    (none)")
     blank()